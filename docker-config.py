@@ -32,3 +32,10 @@ BUILDER = 'default'
 # Примеры: type=registry,ref=registry.example.com/cache
 CACHE_TO = None
 CACHE_FROM = None
+
+# Максимальное число одновременных push/pull при работе с несколькими тегами
+PARALLEL_PUSH = 8
+
+# Подставлять кэш сборки, если CACHE_TO/CACHE_FROM не заданы:
+# type=gha в GitHub Actions с доступом к сервису кэша (ACTIONS_RUNTIME_TOKEN), иначе <REGISTRY_URL>/<IMAGE_NAME>:buildcache
+AUTO_CACHE = True
@@ -3,85 +3,295 @@
 Позволяет собирать образы, отправлять их в реестр и скачивать обратно.
 """
 
-import argparse
+# argparse, json/orjson и concurrent.futures импортируются по месту использования,
+# чтобы не замедлять запуск команд, которым они не нужны
 import subprocess
+import threading
 import os
+import shlex
+import shutil
 import sys
-import json
-from datetime import datetime
-from pathlib import Path
-from typing import Optional, Tuple, Dict, List
+import time
+from typing import Callable, Optional, Tuple, Dict, List, Set
+
+
+# Дескрипторы, открытые Python, по умолчанию не наследуются (PEP 446), поэтому закрывать
+# их в дочернем процессе не нужно. С close_fds=False, без cwd и preexec_fn и с абсолютным
+# путём к программе subprocess запускает процесс через posix_spawn, а не через fork
+# с закрытием дескрипторов (медленно в контейнерах с большим RLIMIT_NOFILE)
+_CLOSE_FDS = False
+
+# Файл конфигурации и его устаревший вариант на Python (читается с --legacy-config)
+CONFIG_FILE = 'docker-config.toml'
+LEGACY_CONFIG_FILE = 'docker-config.py'
+
+# Базовые настройки по умолчанию
+_CONFIG_DEFAULTS = {
+    'dockerfile': 'Dockerfile',
+    'image_name': 'myapp',
+    'registry_url': None,
+    'latest_tag': 'latest',
+    'username': None,
+    'password': None,
+    'platform': 'linux/amd64',  # Платформа по умолчанию
+    'builder': 'default',       # Имя builder'а
+    'cache_to': None,           # Кэширование сборки
+    'cache_from': None,         # Использование кэша
+    'parallel_push': 8,         # Максимум параллельных push/pull
+    'auto_cache': True,         # Подставлять кэш сборки, если он не задан
+}
+
+# (ключ, имя в файле конфигурации, переменная окружения) для каждого параметра
+_CONFIG_KEYS = tuple((key, key.upper(), f'DOCKER_{key.upper()}') for key in _CONFIG_DEFAULTS)
+
+# Операции, доступные в плане команды batch, и соответствующие методы DockerManager
+BATCH_OPERATIONS = {
+    'build': 'build',
+    'push': 'push',
+    'push_many': 'push_many',
+    'pull': 'pull',
+    'pull_many': 'pull_many',
+    'login': 'login',
+    'list': 'list_images',
+    'builders': 'list_builders',
+    'inspect': 'inspect_image',
+    'run': 'run_container',
+    'clean': 'clean',
+    'scan': 'scan_image',
+}
+
+# Каталоги, которые не обходятся при поиске Dockerfile
+_SKIP_DIRS = frozenset({'.git', 'node_modules', '.venv', 'venv', '__pycache__', 'dist', 'build'})
+
+
+def _batch_argument_error(method, step: Dict) -> Optional[str]:
+    """
+    Проверка аргументов шага batch по сигнатуре метода операции
+    
+    Кроме имён аргументов проверяются значения параметров-списков и словарей:
+    они передаются в команду docker без преобразования.
+    
+    Args:
+        method (callable): Метод операции
+        step (dict): Аргументы шага
+        
+    Returns:
+        str: Описание ошибки или None, если аргументы подходят
+    """
+    import inspect
+    import typing
+    
+    signature = inspect.signature(method)
+    try:
+        signature.bind(**step)
+    except TypeError as e:
+        return str(e)
+    
+    for name, value in step.items():
+        if value is None:
+            continue
+        annotation = signature.parameters[name].annotation
+        # Optional[X] - это Union[X, None]: проверяется тип X
+        candidates = typing.get_args(annotation) if typing.get_origin(annotation) is typing.Union else (annotation,)
+        for candidate in candidates:
+            expected = typing.get_origin(candidate) or candidate
+            if expected in (list, dict) and not isinstance(value, expected):
+                return f"{name} должен быть {'списком' if expected is list else 'объектом'}, получено {value!r}"
+    return None
+
+
+def _format_json(text: str) -> Optional[str]:
+    """
+    Форматирование JSON с отступом в 2 пробела
+    
+    Используется orjson, если он установлен (заметно быстрее на больших
+    описаниях образов), иначе стандартный модуль json.
+    
+    Args:
+        text (str): Текст в формате JSON
+        
+    Returns:
+        str: Отформатированный JSON или None, если текст не является JSON
+    """
+    try:
+        import orjson
+    except ImportError:
+        import json
+        try:
+            return json.dumps(json.loads(text), indent=2, ensure_ascii=False)
+        except json.JSONDecodeError:
+            return None
+    
+    try:
+        return orjson.dumps(
+            orjson.loads(text),
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    except orjson.JSONDecodeError:
+        return None
 
 
 class DockerManager:
     """Менеджер для работы с Docker Buildx операциями"""
     
-    def __init__(self, verbose: bool = True):
+    def __init__(self, verbose: bool = True, legacy_config: bool = False):
         """
         Инициализация менеджера Docker
         
         Args:
             verbose (bool): Включить подробный вывод
+            legacy_config (bool): Читать конфигурацию из docker-config.py вместо docker-config.toml
         """
         self.verbose = verbose
-        self.config = self._load_config()
+        self.legacy_config = legacy_config
+        # Путь к docker определяется один раз, чтобы не искать его в PATH при каждом запуске
+        self._docker_bin = shutil.which('docker') or 'docker'
+        # Окружение дочерних процессов собирается один раз; всегда включаем BuildKit
+        self._child_env = {**os.environ, 'DOCKER_BUILDKIT': '1'}
+        self._session: Optional[subprocess.Popen] = None  # Постоянный shell-процесс сессии
+        self._session_stderr: Optional[str] = None        # Файл для stderr захватываемых команд сессии
+        self._session_lock = threading.Lock()             # Сессия используется несколькими потоками
+        self._builders_cache: Optional[Set[str]] = None   # Имена builder'ов из `docker buildx ls`
+        self._active_builder: Optional[str] = None        # Текущий выбранный builder
+        self._dockerfile_ok: Set[str] = set()             # Уже проверенные пути к Dockerfile
+        self._config: Optional[Dict] = None               # Загружается при первом обращении
+        self._parallel_push: Optional[int] = None         # PARALLEL_PUSH, разобранный из конфигурации
         self._check_buildx_installed()
+    
+    @property
+    def config(self) -> Dict:
+        """Конфигурация менеджера (файл конфигурации читается при первом обращении)"""
+        if self._config is None:
+            self._config = self._load_config()
+        return self._config
+    
+    def __enter__(self) -> 'DockerManager':
+        """
+        Открытие сессии: команды выполняются в одном долгоживущем shell-процессе,
+        а не в отдельном процессе, порождаемом из Python на каждый вызов
+        
+        stderr shell наследуется, как у команд вне сессии; stderr захватываемых
+        команд перенаправляется во временный файл и не смешивается с их выводом
+        """
+        import tempfile
+        fd, self._session_stderr = tempfile.mkstemp(prefix='docker-manager-', suffix='.stderr')
+        os.close(fd)
+        self._session = subprocess.Popen(
+            ['/bin/sh'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            # Как и в run_command_streaming: байты не в UTF-8 заменяются, иначе ошибка
+            # декодирования оставила бы вывод команды и маркер в канале непрочитанными
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1,
+            env=self._child_env,
+            close_fds=_CLOSE_FDS
+        )
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Завершение сессии, если она была открыта"""
+        self._close_session()
+        self._remove_session_stderr()
+    
+    def _close_session(self) -> None:
+        """Завершение shell-процесса сессии и закрытие его каналов"""
+        if self._session is None:
+            return
+        session, self._session = self._session, None
+        try:
+            session.stdin.close()
+            session.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            session.kill()
+            session.wait()
+        session.stdout.close()
+    
+    def _remove_session_stderr(self) -> None:
+        """Удаление временного файла stderr сессии"""
+        if self._session_stderr is None:
+            return
+        try:
+            os.unlink(self._session_stderr)
+        except OSError:
+            pass
+        self._session_stderr = None
         
     def _load_config(self) -> Dict:
         """Загрузка конфигурации из файла или переменных окружения"""
-        # Базовые настройки по умолчанию
-        config = {
-            'dockerfile': 'Dockerfile',
-            'image_name': 'myapp',
-            'registry_url': None,
-            'latest_tag': 'latest',
-            'username': None,
-            'password': None,
-            'platform': 'linux/amd64',  # Платформа по умолчанию
-            'builder': 'default',       # Имя builder'а
-            'cache_to': None,           # Кэширование сборки
-            'cache_from': None,         # Использование кэша
-        }
+        config = dict(_CONFIG_DEFAULTS)
         
         # Загрузка из файла конфигурации, если он существует
-        config_file = Path('docker-config.py')
-        if config_file.exists():
-            try:
-                # Динамический импорт конфигурации
-                import importlib.util
-                spec = importlib.util.spec_from_file_location("docker_config", config_file)
-                docker_config = importlib.util.module_from_spec(spec)
-                
-                # Устанавливаем значения по умолчанию
-                for key in config.keys():
-                    if not hasattr(docker_config, key.upper()):
-                        setattr(docker_config, key.upper(), config[key])
-                
-                spec.loader.exec_module(docker_config)
-                
-                # Читаем значения из модуля
-                for key in config.keys():
-                    if hasattr(docker_config, key.upper()):
-                        config[key] = getattr(docker_config, key.upper())
-            except Exception as e:
-                self.log(f"Warning: Config file exists but couldn't be imported: {str(e)}", "WARNING")
+        if self.legacy_config:
+            docker_config = self._read_legacy_config(config)
+        else:
+            docker_config = self._read_toml_config()
+        
+        for key, name, _ in _CONFIG_KEYS:
+            if name in docker_config:
+                config[key] = docker_config[name]
         
         # Переопределение переменными окружения
-        for key in config.keys():
-            env_key = f'DOCKER_{key.upper()}'
+        for key, _, env_key in _CONFIG_KEYS:
             if env_key in os.environ:
                 config[key] = os.environ[env_key]
                 
         return config
     
+    def _read_toml_config(self) -> Dict:
+        """Чтение docker-config.toml (без выполнения какого-либо кода)"""
+        if not os.path.exists(CONFIG_FILE):
+            if os.path.exists(LEGACY_CONFIG_FILE):
+                self.log(f"Найден {LEGACY_CONFIG_FILE}, но он читается только с флагом --legacy-config", "WARNING")
+                self.log(f"Создайте {CONFIG_FILE} командой init", "INFO")
+            return {}
+        
+        try:
+            import tomllib  # Python 3.11+
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                self.log(f"Для чтения {CONFIG_FILE} нужен Python 3.11+ или пакет tomli", "WARNING")
+                return {}
+        
+        try:
+            with open(CONFIG_FILE, 'rb') as f:
+                return tomllib.load(f)
+        except (OSError, tomllib.TOMLDecodeError) as e:
+            self.log(f"Warning: Config file exists but couldn't be parsed: {str(e)}", "WARNING")
+            return {}
+    
+    def _read_legacy_config(self, defaults: Dict) -> Dict:
+        """Выполнение docker-config.py (устаревший формат конфигурации)"""
+        if not os.path.exists(LEGACY_CONFIG_FILE):
+            return {}
+        
+        try:
+            # Выполнение файла конфигурации без создания модуля,
+            # значения по умолчанию доступны в нём как глобальные переменные
+            import runpy
+            return runpy.run_path(
+                LEGACY_CONFIG_FILE,
+                init_globals={name: defaults[key] for key, name, _ in _CONFIG_KEYS}
+            )
+        except Exception as e:
+            self.log(f"Warning: Config file exists but couldn't be imported: {str(e)}", "WARNING")
+            return {}
+    
     def _check_buildx_installed(self) -> bool:
         """Проверка установки Docker Buildx"""
         try:
             result = subprocess.run(
-                ['docker', 'buildx', 'version'],
+                [self._docker_bin, 'buildx', 'version'],
                 capture_output=True,
                 text=True,
-                check=False
+                check=False,
+                close_fds=_CLOSE_FDS
             )
             if result.returncode != 0:
                 self.log("Docker Buildx не установлен или не настроен", "WARNING")
@@ -93,80 +303,260 @@ class DockerManager:
     
     def log(self, message: str, level: str = "INFO") -> None:
         """Логирование сообщений"""
-        if self.verbose:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print(f"[{timestamp}] [{level}] {message}")
+        if not self.verbose:
+            return
+        # Одна запись строки целиком: быстрее print и не перемешивается между потоками
+        sys.stdout.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] [{level}] {message}\n")
     
-    def run_command(self, cmd: str, capture_output: bool = False) -> Tuple[bool, Optional[str]]:
+    def run_command(self,
+                    argv: List[str],
+                    capture_output: bool = False,
+                    input_data: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         """
-        Выполнение shell команды
+        Выполнение команды без участия shell
         
         Args:
-            cmd (str): Команда для выполнения
+            argv (list): Команда и её аргументы
             capture_output (bool): Захватить вывод команды
+            input_data (str): Данные, передаваемые в stdin команды
             
         Returns:
             tuple: (success, output) или (success, None)
         """
-        self.log(f"Выполнение команды: {cmd}")
+        if self.verbose:
+            self.log(f"Выполнение команды: {shlex.join(argv)}")
+        
+        # В сессии stdin занят самим shell, поэтому команды с входными данными
+        # по-прежнему запускаются отдельным процессом
+        if self._session is not None and input_data is None:
+            return self._run_in_session(argv, capture_output)
         
         try:
             if capture_output:
                 result = subprocess.run(
-                    cmd, 
-                    shell=True, 
+                    argv, 
                     check=True, 
                     capture_output=True, 
                     text=True,
-                    env={**os.environ, 'DOCKER_BUILDKIT': '1'}  # Всегда включаем BuildKit
+                    input=input_data,
+                    env=self._child_env,
+                    close_fds=_CLOSE_FDS
                 )
                 output = result.stdout
                 self.log(f"Успешно выполнено")
                 return True, output
             else:
                 subprocess.run(
-                    cmd, 
-                    shell=True, 
+                    argv, 
                     check=True,
-                    env={**os.environ, 'DOCKER_BUILDKIT': '1'}
+                    text=True,
+                    input=input_data,
+                    env=self._child_env,
+                    close_fds=_CLOSE_FDS
                 )
                 self.log(f"Успешно выполнено")
                 return True, None
+        except FileNotFoundError as e:
+            self.log(f"Команда не найдена: {e.filename}", "ERROR")
+            return False, None
         except subprocess.CalledProcessError as e:
             self.log(f"Ошибка выполнения команды: {e}", "ERROR")
             if capture_output:
                 self.log(f"Вывод ошибки: {e.stderr}", "ERROR")
             return False, e.stderr if capture_output else None
     
+    def run_command_streaming(self, argv: List[str], tail_lines: int = 2000) -> Tuple[bool, Optional[str]]:
+        """
+        Выполнение команды с построчным чтением вывода
+        
+        Вывод (stdout и stderr) показывается по мере поступления в подробном режиме,
+        в тихом режиме в памяти хранятся только последние tail_lines строк, которые
+        возвращаются при ошибке. Используется для команд с объёмным выводом
+        (build, push, pull); сессия для них не используется, так как время запуска
+        процесса несущественно на фоне самой операции.
+        
+        Args:
+            argv (list): Команда и её аргументы
+            tail_lines (int): Сколько последних строк вывода сохранить
+            
+        Returns:
+            tuple: (success, последние строки вывода при ошибке в тихом режиме или None)
+        """
+        from collections import deque
+        
+        if self.verbose:
+            self.log(f"Выполнение команды: {shlex.join(argv)}")
+        
+        try:
+            process = subprocess.Popen(
+                argv,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                # Вывод сборки может быть не в UTF-8 (например, компилятор с локалью cp1251):
+                # такие байты заменяются, а не прерывают чтение посреди операции
+                encoding='utf-8',
+                errors='replace',
+                bufsize=1,
+                env=self._child_env,
+                close_fds=_CLOSE_FDS
+            )
+        except FileNotFoundError as e:
+            self.log(f"Команда не найдена: {e.filename}", "ERROR")
+            return False, None
+        
+        tail = deque(maxlen=tail_lines)
+        with process:
+            for line in process.stdout:
+                if self.verbose:
+                    # stdout в CI - канал с блочной буферизацией, сбрасываем каждую строку,
+                    # чтобы лог сборки был виден по мере выполнения
+                    sys.stdout.write(line)
+                    sys.stdout.flush()
+                else:
+                    tail.append(line)
+        
+        if process.returncode != 0:
+            self.log(f"Ошибка выполнения команды: код возврата {process.returncode}", "ERROR")
+            # В подробном режиме вывод уже показан, в тихом - возвращаем его хвост
+            return False, None if self.verbose else ''.join(tail)
+        
+        self.log(f"Успешно выполнено")
+        return True, None
+    
+    def _run_in_session(self, argv: List[str], capture_output: bool) -> Tuple[bool, Optional[str]]:
+        """
+        Выполнение команды в открытой сессии
+        
+        Команда передаётся в shell в экранированном виде, после неё печатается
+        строка-маркер с кодом возврата, по которой определяется конец вывода.
+        При захвате вывода stderr команды записывается во временный файл сессии
+        и, как в run_command, возвращается вместо вывода при ошибке.
+        
+        Args:
+            argv (list): Команда и её аргументы
+            capture_output (bool): Захватить вывод команды
+            
+        Returns:
+            tuple: (success, output) или (success, None)
+        """
+        # Сессия - один канал, параллельные вызовы выполняются в ней по очереди
+        with self._session_lock:
+            return self._run_in_session_locked(argv, capture_output)
+    
+    def _run_in_session_locked(self, argv: List[str], capture_output: bool) -> Tuple[bool, Optional[str]]:
+        """Выполнение команды в сессии (вызывается под self._session_lock)"""
+        if self._session is None:
+            return False, None
+        
+        marker = f"__DM_DONE_{os.getpid()}__:"
+        redirect = " </dev/null"
+        if capture_output:
+            redirect += f" 2>{shlex.quote(self._session_stderr)}"
+        try:
+            self._session.stdin.write(f"{shlex.join(argv)}{redirect}\n")
+            self._session.stdin.write(f"printf '%s%d\\n' '{marker}' $?\n")
+            self._session.stdin.flush()
+        except OSError as e:
+            self.log(f"Сессия shell недоступна: {e}", "ERROR")
+            self._close_session()
+            return False, None
+        
+        lines = []
+        returncode = None
+        for line in self._session.stdout:
+            index = line.find(marker)
+            if index >= 0:
+                # Вывод без завершающего перевода строки оказывается перед маркером
+                line, returncode = line[:index], int(line[index + len(marker):])
+            if capture_output:
+                lines.append(line)
+            else:
+                sys.stdout.write(line)
+                sys.stdout.flush()
+            if returncode is not None:
+                break
+        
+        output = ''.join(lines)
+        if returncode is None:
+            self.log("Сессия shell неожиданно завершилась", "ERROR")
+            self._close_session()
+            return False, output if capture_output else None
+        if returncode != 0:
+            self.log(f"Ошибка выполнения команды: код возврата {returncode}", "ERROR")
+            if not capture_output:
+                return False, None
+            try:
+                with open(self._session_stderr, encoding='utf-8', errors='replace') as stderr_file:
+                    stderr = stderr_file.read()
+            except OSError:
+                stderr = ''
+            self.log(f"Вывод ошибки: {stderr}", "ERROR")
+            return False, stderr
+        
+        self.log(f"Успешно выполнено")
+        return True, output if capture_output else None
+    
     def check_dockerfile_exists(self, dockerfile_path: str) -> bool:
-        """Проверка существования Dockerfile"""
-        dockerfile = Path(dockerfile_path)
-        if not dockerfile.exists():
+        """Проверка существования Dockerfile (найденные пути запоминаются)"""
+        abs_path = os.path.abspath(dockerfile_path)
+        if abs_path in self._dockerfile_ok:
+            return True
+        
+        if not os.path.exists(dockerfile_path):
             self.log(f"❌ Dockerfile не найден: {dockerfile_path}", "ERROR")
             self.log(f"📁 Текущая директория: {os.getcwd()}", "INFO")
             
             # Показать доступные Dockerfile
-            try:
-                result = subprocess.run(
-                    ["find", ".", "-name", "Dockerfile*", "-type", "f"],
-                    capture_output=True,
-                    text=True
-                )
-                if result.stdout.strip():
-                    self.log("📋 Найдены следующие Dockerfile:", "INFO")
-                    for line in result.stdout.strip().split('\n'):
-                        self.log(f"   - {line}", "INFO")
-                else:
-                    self.log("📋 Dockerfile не найдены в проекте", "INFO")
-            except:
-                pass
+            found = self._find_dockerfiles()
+            if found:
+                self.log("📋 Найдены следующие Dockerfile:", "INFO")
+                for path in found:
+                    self.log(f"   - {path}", "INFO")
+            else:
+                self.log("📋 Dockerfile не найдены в проекте", "INFO")
             
             self.log("\n💡 Создайте Dockerfile или укажите существующий:", "INFO")
             self.log("   python3 docker-manager.py build --dockerfile path/to/Dockerfile", "INFO")
             self.log("   или используйте один из шаблонов в README.md", "INFO")
             return False
+        
+        self._dockerfile_ok.add(abs_path)
         return True
     
+    def invalidate_fs_cache(self) -> None:
+        """Сброс запомненных результатов проверок файловой системы"""
+        self._dockerfile_ok.clear()
+    
+    @staticmethod
+    def _find_dockerfiles(root: str = ".", max_depth: int = 5, limit: int = 50) -> List[str]:
+        """
+        Поиск файлов Dockerfile* в проекте
+        
+        Служебные и тяжёлые каталоги (.git, node_modules, виртуальные окружения,
+        результаты сборки) не обходятся.
+        
+        Args:
+            root (str): Каталог, с которого начинается поиск
+            max_depth (int): Максимальная глубина вложенности каталогов
+            limit (int): Максимальное число найденных файлов
+            
+        Returns:
+            list: Пути к найденным файлам
+        """
+        found = []
+        base_depth = root.rstrip(os.sep).count(os.sep)
+        for dirpath, dirnames, filenames in os.walk(root, onerror=lambda e: None):
+            if dirpath.count(os.sep) - base_depth >= max_depth:
+                dirnames[:] = []
+            else:
+                dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS)
+            for filename in sorted(filenames):
+                if filename.startswith('Dockerfile'):
+                    found.append(os.path.join(dirpath, filename))
+                    if len(found) >= limit:
+                        return found
+        return found
+    
     def setup_buildx_builder(self, builder_name: str = "multiarch") -> bool:
         """
         Настройка Buildx builder'а для мультиархитектурной сборки
@@ -179,21 +569,115 @@ class DockerManager:
         """
         self.log(f"Настройка Buildx builder'а: {builder_name}")
         
-        # Проверяем существующий builder
-        cmd = f"docker buildx ls"
-        success, output = self.run_command(cmd, capture_output=True)
+        # Builder default существует всегда, а при сборке он выбирается через --builder
+        if builder_name == 'default':
+            return True
         
-        if success and output:
-            if builder_name in output:
-                self.log(f"Builder '{builder_name}' уже существует, используем его")
-                # Используем существующий builder
-                cmd = f"docker buildx use {builder_name}"
-                return self.run_command(cmd)[0]
+        # Builder уже выбран этим менеджером или отмечен текущим в `docker buildx ls`
+        if builder_name == self._active_builder:
+            return True
         
-        # Создаем новый builder
-        self.log(f"Создание нового builder'а: {builder_name}")
-        cmd = f"docker buildx create --name {builder_name} --use --bootstrap"
-        return self.run_command(cmd)[0]
+        # Проверяем существующий builder (список запрашиваем один раз за процесс)
+        if self._builders_cache is None:
+            cmd = [self._docker_bin, "buildx", "ls"]
+            success, output = self.run_command(cmd, capture_output=True)
+            if success and output:
+                self._store_builders(output)
+                if builder_name == self._active_builder:
+                    self.log(f"Builder '{builder_name}' уже выбран")
+                    return True
+        
+        if self._builders_cache is not None and builder_name in self._builders_cache:
+            self.log(f"Builder '{builder_name}' уже существует, используем его")
+            # Используем существующий builder
+            cmd = [self._docker_bin, "buildx", "use", builder_name]
+            success = self.run_command(cmd)[0]
+        else:
+            # Создаем новый builder
+            self.log(f"Создание нового builder'а: {builder_name}")
+            cmd = [self._docker_bin, "buildx", "create", "--name", builder_name, "--use", "--bootstrap"]
+            success = self.run_command(cmd)[0]
+            if success and self._builders_cache is not None:
+                self._builders_cache.add(builder_name)
+        
+        if success:
+            self._active_builder = builder_name
+        return success
+    
+    def _store_builders(self, output: str) -> None:
+        """
+        Разбор вывода `docker buildx ls` и сохранение списка builder'ов
+        
+        Строки builder'ов начинаются без отступа, строки их узлов - с отступом.
+        Текущий builder помечен символом `*` после имени.
+        
+        Args:
+            output (str): Вывод команды
+        """
+        builders = set()
+        active = None
+        for line in output.splitlines()[1:]:  # Первая строка - заголовок таблицы
+            if not line or line[0].isspace():
+                continue
+            fields = line.split()
+            name = fields[0].rstrip('*')
+            builders.add(name)
+            if fields[0].endswith('*') or (len(fields) > 1 and fields[1] == '*'):
+                active = name
+        self._builders_cache = builders
+        self._active_builder = active
+    
+    def _config_flag(self, key: str) -> bool:
+        """Чтение логического параметра (из переменной окружения он приходит строкой)"""
+        value = self.config[key]
+        if isinstance(value, str):
+            return value.strip().lower() not in ('', '0', 'false', 'no', 'off')
+        return bool(value)
+    
+    def _config_int(self, key: str) -> int:
+        """Чтение целочисленного параметра; при неверном значении используется значение по умолчанию"""
+        value = self.config[key]
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            default = _CONFIG_DEFAULTS[key]
+            self.log(f"Неверное значение {key.upper()}: {value!r}, используется {default}", "WARNING")
+            return default
+    
+    def _default_cache(self, builder: str, push: bool) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Кэш сборки по умолчанию
+        
+        В GitHub Actions используется кэш GitHub (type=gha), иначе - кэш в реестре
+        рядом с образом (тег buildcache). Экспорт кэша не поддерживается драйвером
+        docker, поэтому для builder'а default задаётся только источник кэша.
+        
+        Кэш gha выбирается только для builder'а с экспортом кэша и только если шаг
+        получил доступ к сервису кэша (ACTIONS_RUNTIME_TOKEN и ACTIONS_CACHE_URL или
+        ACTIONS_RESULTS_URL, например через crazy-max/ghaction-github-runtime): в
+        обычном шаге `run:` этих переменных нет, и драйвер docker gha не поддерживает.
+        
+        Args:
+            builder (str): Имя builder'а
+            push (bool): Образ отправляется в реестр
+            
+        Returns:
+            tuple: (cache_from, cache_to)
+        """
+        can_export = builder != 'default'
+        
+        if (can_export
+                and os.environ.get('GITHUB_ACTIONS') == 'true'
+                and os.environ.get('ACTIONS_RUNTIME_TOKEN')
+                and (os.environ.get('ACTIONS_CACHE_URL') or os.environ.get('ACTIONS_RESULTS_URL'))):
+            return "type=gha", "type=gha,mode=max"
+        
+        registry_url = self.config['registry_url']
+        if not registry_url:
+            return None, None
+        
+        cache_ref = f"type=registry,ref={registry_url}/{self.config['image_name']}:buildcache"
+        return cache_ref, (f"{cache_ref},mode=max" if push and can_export else None)
     
     def build(self, 
               tag: Optional[str] = None, 
@@ -206,7 +690,8 @@ class DockerManager:
               load: bool = False,
               builder: Optional[str] = None,
               cache_to: Optional[str] = None,
-              cache_from: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+              cache_from: Optional[str] = None,
+              auto_cache: Optional[bool] = None) -> Tuple[bool, Optional[str]]:
         """
         Сборка Docker образа с помощью Buildx
         
@@ -222,6 +707,7 @@ class DockerManager:
             builder (str): Имя builder'а
             cache_to (str): Сохранять кэш сборки
             cache_from (str): Использовать кэш из указанного источника
+            auto_cache (bool): Подставить кэш по умолчанию, если cache_to/cache_from не заданы
             
         Returns:
             tuple: (success, output)
@@ -244,13 +730,32 @@ class DockerManager:
         if cache_from is None:
             cache_from = self.config['cache_from']
         
+        if auto_cache is None:
+            auto_cache = self._config_flag('auto_cache')
+        
         # Проверяем существование Dockerfile
         if not self.check_dockerfile_exists(dockerfile):
             return False, None
         
-        # Настраиваем builder
-        if not self.setup_buildx_builder(builder):
+        # Builder default (драйвер docker) собирает под одну платформу и экспортирует
+        # только inline-кэш. Выбранный builder не подменяется: о сборке, которую
+        # он не поддерживает, только предупреждаем
+        exports_cache = bool(cache_to) and not cache_to.startswith('type=inline')
+        if builder == 'default' and (',' in (platform or '') or exports_cache):
+            self.log("Builder default не поддерживает мультиплатформенную сборку и экспорт кэша, "
+                     "укажите builder с драйвером docker-container (--builder)", "WARNING")
+        
+        # Настраиваем builder, default не требует создания и переключения
+        if builder != 'default' and not self.setup_buildx_builder(builder):
             self.log("Используем builder по умолчанию", "WARNING")
+            builder = 'default'
+        
+        if auto_cache:
+            default_cache_from, default_cache_to = self._default_cache(builder, push)
+            if cache_from is None:
+                cache_from = default_cache_from
+            if cache_to is None:
+                cache_to = default_cache_to
         
         image_name = self.config['image_name']
         full_image_name = f"{image_name}:{tag}"
@@ -260,47 +765,26 @@ class DockerManager:
             full_image_name = f"{self.config['registry_url']}/{full_image_name}"
         
         # Формирование команды сборки
-        cmd_parts = ["docker buildx build"]
-        
-        # Добавляем тег
-        cmd_parts.append(f"-t {full_image_name}")
-        
-        # Добавляем Dockerfile
-        if dockerfile:
-            cmd_parts.append(f"-f {dockerfile}")
-        
-        # Платформы
-        if platform:
-            cmd_parts.append(f"--platform {platform}")
-        
-        # Кэширование
-        if cache_to:
-            cmd_parts.append(f"--cache-to {cache_to}")
-        
-        if cache_from:
-            cmd_parts.append(f"--cache-from {cache_from}")
-        
-        if no_cache:
-            cmd_parts.append("--no-cache")
-        
-        if pull:
-            cmd_parts.append("--pull")
-        
-        # Действия после сборки
-        if push:
-            cmd_parts.append("--push")
-        elif load:
-            cmd_parts.append("--load")
-        else:
-            cmd_parts.append("--load")  # По умолчанию загружаем в локальный Docker
-        
-        # Прогресс
-        cmd_parts.append("--progress=plain")
-        
-        # Контекст
-        cmd_parts.append(context)
-        
-        cmd = " ".join(cmd_parts)
+        cmd_parts = [self._docker_bin, "buildx", "build", "-t", full_image_name]
+        
+        # Параметры со значением: builder указываем явно, чтобы не зависеть от текущего
+        for flag, value in (("--builder", builder),
+                            ("-f", dockerfile),
+                            ("--platform", platform),
+                            ("--cache-to", cache_to),
+                            ("--cache-from", cache_from)):
+            if value:
+                cmd_parts += [flag, value]
+        
+        # Флаги; без --push образ по умолчанию загружается в локальный Docker
+        for flag, enabled in (("--no-cache", no_cache),
+                              ("--pull", pull),
+                              ("--push", push),
+                              ("--load", not push)):
+            if enabled:
+                cmd_parts.append(flag)
+        
+        cmd_parts += ["--progress=plain", context]
         
         self.log(f"🚀 Сборка образа с Buildx")
         self.log(f"   Образ: {full_image_name}")
@@ -312,7 +796,7 @@ class DockerManager:
         else:
             self.log(f"   Действие: загрузка в локальный Docker")
         
-        return self.run_command(cmd)
+        return self.run_command_streaming(cmd_parts)
     
     def push(self, tag: Optional[str] = None, registry_url: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         """
@@ -341,17 +825,17 @@ class DockerManager:
         target_image = f"{registry_url}/{source_image}"
         
         # Тегируем образ
-        cmd_tag = f"docker tag {source_image} {target_image}"
+        cmd_tag = [self._docker_bin, "tag", source_image, target_image]
         success, _ = self.run_command(cmd_tag)
         if not success:
             return False, None
         
         # Отправляем в реестр
-        cmd_push = f"docker push {target_image}"
+        cmd_push = [self._docker_bin, "push", target_image]
         
         self.log(f"📤 Отправка образа: {target_image}")
         
-        return self.run_command(cmd_push)
+        return self.run_command_streaming(cmd_push)
     
     def pull(self, tag: Optional[str] = None, registry_url: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         """
@@ -377,11 +861,91 @@ class DockerManager:
         image_name = self.config['image_name']
         full_image_name = f"{registry_url}/{image_name}:{tag}"
         
-        cmd = f"docker pull {full_image_name}"
+        cmd = [self._docker_bin, "pull", full_image_name]
         
         self.log(f"📥 Скачивание образа: {full_image_name}")
         
-        return self.run_command(cmd)
+        return self.run_command_streaming(cmd)
+    
+    def _parallel_max_workers(self, max_workers: Optional[int]) -> int:
+        """Число потоков для параллельных операций с реестром"""
+        if max_workers is None:
+            if self._parallel_push is None:
+                self._parallel_push = self._config_int('parallel_push')
+            max_workers = self._parallel_push
+        return max(1, max_workers)
+    
+    def _run_many(self,
+                  operation: Callable[[str, Optional[str]], Tuple[bool, Optional[str]]],
+                  tags: List[str],
+                  registry_url: Optional[str],
+                  max_workers: Optional[int]) -> Tuple[bool, Optional[str]]:
+        """
+        Параллельное выполнение операции с реестром для нескольких тегов
+        
+        Args:
+            operation (callable): Операция над одним тегом (push или pull)
+            tags (list): Теги образа
+            registry_url (str): URL реестра
+            max_workers (int): Максимум одновременных операций (по умолчанию PARALLEL_PUSH)
+            
+        Returns:
+            tuple: (success, вывод неудачных тегов)
+        """
+        # Строка - один тег, а не список: иначе операция выполнилась бы для каждого символа
+        if isinstance(tags, str):
+            self.log(f"Ожидается список тегов, получена строка {tags!r}", "ERROR")
+            return False, None
+        
+        # Повторяющиеся теги указывают на один и тот же образ в реестре,
+        # поэтому операция выполняется для каждого только один раз
+        tags = list(dict.fromkeys(tags))
+        if not tags:
+            return True, None
+        
+        from concurrent.futures import ThreadPoolExecutor
+        max_workers = min(self._parallel_max_workers(max_workers), len(tags))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda tag: operation(tag, registry_url), tags))
+        
+        failed_outputs = [f"{tag}:\n{output.rstrip()}"
+                          for tag, (success, output) in zip(tags, results)
+                          if not success and output]
+        return all(success for success, _ in results), '\n'.join(failed_outputs) or None
+    
+    def push_many(self,
+                  tags: List[str],
+                  registry_url: Optional[str] = None,
+                  max_workers: Optional[int] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Параллельная отправка нескольких тегов образа в реестр
+        
+        Args:
+            tags (list): Теги образа
+            registry_url (str): URL реестра
+            max_workers (int): Максимум одновременных отправок (по умолчанию PARALLEL_PUSH)
+            
+        Returns:
+            tuple: (success, output)
+        """
+        return self._run_many(self.push, tags, registry_url, max_workers)
+    
+    def pull_many(self,
+                  tags: List[str],
+                  registry_url: Optional[str] = None,
+                  max_workers: Optional[int] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Параллельное скачивание нескольких тегов образа из реестра
+        
+        Args:
+            tags (list): Теги образа
+            registry_url (str): URL реестра
+            max_workers (int): Максимум одновременных скачиваний (по умолчанию PARALLEL_PUSH)
+            
+        Returns:
+            tuple: (success, output)
+        """
+        return self._run_many(self.pull, tags, registry_url, max_workers)
     
     def login(self, 
               registry_url: Optional[str] = None, 
@@ -411,24 +975,30 @@ class DockerManager:
             self.log("Не хватает данных для авторизации", "ERROR")
             return False, None
         
-        # Используем stdin для передачи пароля
-        cmd = f"echo '{password}' | docker login {registry_url} -u {username} --password-stdin"
+        # Пароль передаём напрямую в stdin docker login: без shell и echo он не попадает
+        # ни в аргументы процессов, ни в историю, и не требует экранирования.
+        # Команды с stdin всегда выполняются отдельным процессом, даже в сессии
+        cmd = [self._docker_bin, "login", registry_url, "-u", username, "--password-stdin"]
         
         self.log(f"🔑 Авторизация в реестре: {registry_url}")
         
-        return self.run_command(cmd)
+        # Ответ реестра (или текст ошибки) возвращается как результат команды
+        return self.run_command(cmd, capture_output=True, input_data=password)
     
     def list_images(self) -> Tuple[bool, Optional[str]]:
         """Список локальных Docker образов"""
-        cmd = "docker images --format 'table {{.Repository}}\\t{{.Tag}}\\t{{.Size}}\\t{{.CreatedAt}}'"
+        cmd = [self._docker_bin, "images", "--format", "table {{.Repository}}\\t{{.Tag}}\\t{{.Size}}\\t{{.CreatedAt}}"]
         self.log("📋 Получение списка локальных образов")
         return self.run_command(cmd, capture_output=True)
     
     def list_builders(self) -> Tuple[bool, Optional[str]]:
         """Список доступных Buildx builders"""
-        cmd = "docker buildx ls"
+        cmd = [self._docker_bin, "buildx", "ls"]
         self.log("🔧 Получение списка Buildx builders")
-        return self.run_command(cmd, capture_output=True)
+        success, output = self.run_command(cmd, capture_output=True)
+        if success and output:
+            self._store_builders(output)
+        return success, output
     
     def inspect_image(self, tag: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         """
@@ -446,19 +1016,15 @@ class DockerManager:
         image_name = self.config['image_name']
         full_image_name = f"{image_name}:{tag}"
         
-        cmd = f"docker image inspect {full_image_name} --format '{{{{json .}}}}'"
+        cmd = [self._docker_bin, "image", "inspect", full_image_name, "--format", "{{json .}}"]
         
         self.log(f"🔍 Инспекция образа: {full_image_name}")
         
         success, output = self.run_command(cmd, capture_output=True)
         
         if success and output:
-            try:
-                image_info = json.loads(output)
-                formatted_output = json.dumps(image_info, indent=2, ensure_ascii=False)
-                return True, formatted_output
-            except json.JSONDecodeError:
-                return True, output
+            formatted_output = _format_json(output)
+            return True, formatted_output if formatted_output is not None else output
         
         return success, output
     
@@ -488,7 +1054,7 @@ class DockerManager:
         image_name = self.config['image_name']
         full_image_name = f"{image_name}:{image_tag}"
         
-        cmd_parts = ["docker run"]
+        cmd_parts = [self._docker_bin, "run"]
         
         if detach:
             cmd_parts.append("-d")
@@ -497,26 +1063,25 @@ class DockerManager:
             cmd_parts.append("--rm")
         
         if name:
-            cmd_parts.append(f"--name {name}")
+            cmd_parts += ["--name", name]
         
         if ports:
             for host_port, container_port in ports.items():
-                cmd_parts.append(f"-p {host_port}:{container_port}")
+                cmd_parts += ["-p", f"{host_port}:{container_port}"]
         
         if volumes:
             for host_path, container_path in volumes.items():
-                cmd_parts.append(f"-v {host_path}:{container_path}")
+                cmd_parts += ["-v", f"{host_path}:{container_path}"]
         
         if env:
             for key, value in env.items():
-                cmd_parts.append(f"-e {key}='{value}'")
+                cmd_parts += ["-e", f"{key}={value}"]
         
         cmd_parts.append(full_image_name)
-        cmd = " ".join(cmd_parts)
         
         self.log(f"▶️  Запуск контейнера: {full_image_name}")
         
-        return self.run_command(cmd)
+        return self.run_command(cmd_parts)
     
     def clean(self, 
               remove_containers: bool = False, 
@@ -535,32 +1100,55 @@ class DockerManager:
         Returns:
             tuple: (success, output)
         """
-        commands = []
+        # Полная очистка выполняется одной командой: граф объектов Docker
+        # обходится один раз (дополнительно удаляются неиспользуемые сети).
+        # system prune очищает только кэш сборки демона, а `builder prune` с BuildKit
+        # очищает текущий builder (например, multiarch), поэтому он выполняется отдельно
+        if remove_containers and remove_images and remove_volumes and remove_build_cache:
+            all_success = True
+            for cmd in ([self._docker_bin, "system", "prune", "-af", "--volumes"],
+                        [self._docker_bin, "builder", "prune", "-af"]):
+                self.log(f"🧹 Очистка: {shlex.join(cmd)}")
+                if not self.run_command(cmd)[0]:
+                    all_success = False
+            return all_success, None
         
-        if remove_containers:
-            commands.append("docker container prune -f")
+        commands = []
         
         if remove_images:
-            commands.append("docker image prune -af")
+            commands.append([self._docker_bin, "image", "prune", "-af"])
         
         if remove_volumes:
-            commands.append("docker volume prune -f")
+            commands.append([self._docker_bin, "volume", "prune", "-f"])
         
         if remove_build_cache:
-            commands.append("docker builder prune -af")
+            commands.append([self._docker_bin, "builder", "prune", "-af"])
         
-        if not commands:
+        if not commands and not remove_containers:
             self.log("Не указано что очищать", "WARNING")
             return True, None
         
         all_success = True
+        
+        # Образы и тома, которые использует остановленный контейнер, не считаются
+        # неиспользуемыми, поэтому контейнеры удаляются первыми и до остальной очистки
+        if remove_containers:
+            cmd = [self._docker_bin, "container", "prune", "-f"]
+            self.log(f"🧹 Очистка: {shlex.join(cmd)}")
+            all_success = self.run_command(cmd)[0]
+        
+        if not commands:
+            return all_success, None
+        
         for cmd in commands:
-            self.log(f"🧹 Очистка: {cmd}")
-            success, _ = self.run_command(cmd)
-            if not success:
-                all_success = False
+            self.log(f"🧹 Очистка: {shlex.join(cmd)}")
         
-        return all_success, None
+        # Образы, тома и кэш сборки друг от друга не зависят, очищаем их параллельно
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+            results = list(executor.map(self.run_command, commands))
+        
+        return all_success and all(success for success, _ in results), None
     
     def scan_image(self, tag: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         """
@@ -578,19 +1166,60 @@ class DockerManager:
         image_name = self.config['image_name']
         full_image_name = f"{image_name}:{tag}"
         
-        cmd = f"docker scan {full_image_name}"
+        cmd = [self._docker_bin, "scan", full_image_name]
         
         self.log(f"🔒 Сканирование образа на уязвимости: {full_image_name}")
         
         return self.run_command(cmd, capture_output=True)
+    
+    def run_batch(self, plan: List[Dict]) -> Tuple[bool, Optional[str]]:
+        """
+        Последовательное выполнение нескольких операций в одном процессе
+        
+        Кэш builder'ов, проверенные Dockerfile и конфигурация используются всеми шагами.
+        Выполнение останавливается на первом неудачном шаге.
+        
+        Args:
+            plan (list): Шаги вида {"op": "build", "tag": "v1"}; op - имя операции
+                из BATCH_OPERATIONS, остальные ключи - аргументы соответствующего метода
+            
+        Returns:
+            tuple: (success, объединённый вывод шагов)
+        """
+        outputs = []
+        for number, step in enumerate(plan, 1):
+            if not isinstance(step, dict):
+                self.log(f"Шаг {number}: ожидается объект с ключом op", "ERROR")
+                return False, '\n'.join(outputs) or None
+            
+            step = dict(step)
+            op = step.pop('op', None)
+            if op not in BATCH_OPERATIONS:
+                self.log(f"Шаг {number}: неизвестная операция {op!r}", "ERROR")
+                return False, '\n'.join(outputs) or None
+            
+            self.log(f"▶️  Шаг {number}/{len(plan)}: {op}")
+            # Аргументы проверяются до вызова: TypeError из самой операции не скрывается
+            method = getattr(self, BATCH_OPERATIONS[op])
+            error = _batch_argument_error(method, step)
+            if error is not None:
+                self.log(f"Шаг {number}: неверные аргументы операции {op}: {error}", "ERROR")
+                return False, '\n'.join(outputs) or None
+            
+            success, output = method(**step)
+            if output:
+                outputs.append(output)
+            if not success:
+                self.log(f"Шаг {number} ({op}) завершился с ошибкой", "ERROR")
+                return False, '\n'.join(outputs) or None
+        
+        return True, '\n'.join(outputs) or None
 
 
 def create_config_template():
     """Создание шаблона файла конфигурации"""
-    config_template = '''"""
-Конфигурация Docker Manager с Buildx
-Все параметры можно переопределить переменными окружения с префиксом DOCKER_
-"""
+    config_template = '''# Конфигурация Docker Manager с Buildx
+# Все параметры можно переопределить переменными окружения с префиксом DOCKER_
 
 # Имя Dockerfile (по умолчанию: Dockerfile)
 DOCKERFILE = 'Dockerfile'
@@ -599,16 +1228,17 @@ DOCKERFILE = 'Dockerfile'
 IMAGE_NAME = 'myapp'
 
 # URL Docker реестра (например: registry.gitlab.com/username/project)
-REGISTRY_URL = None
+# REGISTRY_URL = 'registry.example.com/project'
 
 # Тег по умолчанию (по умолчанию: latest)
 LATEST_TAG = 'latest'
 
 # Имя пользователя для авторизации в реестре
-USERNAME = None
+# USERNAME = 'your-username'
 
 # Пароль или токен для авторизации в реестре
-PASSWORD = None
+# (лучше передавать через переменную окружения DOCKER_PASSWORD)
+# PASSWORD = 'your-token'
 
 # Платформа для сборки (можно указать несколько через запятую)
 # Примеры: linux/amd64, linux/amd64,linux/arm64, linux/arm/v7
@@ -619,19 +1249,28 @@ BUILDER = 'default'
 
 # Кэширование сборки (опционально)
 # Примеры: type=registry,ref=registry.example.com/cache
-CACHE_TO = None
-CACHE_FROM = None
+# CACHE_TO = 'type=registry,ref=registry.example.com/cache,mode=max'
+# CACHE_FROM = 'type=registry,ref=registry.example.com/cache'
+
+# Максимальное число одновременных push/pull при работе с несколькими тегами
+PARALLEL_PUSH = 8
+
+# Подставлять кэш сборки, если CACHE_TO/CACHE_FROM не заданы:
+# type=gha в GitHub Actions с доступом к сервису кэша (ACTIONS_RUNTIME_TOKEN), иначе <REGISTRY_URL>/<IMAGE_NAME>:buildcache
+AUTO_CACHE = true
 '''
     
-    with open('docker-config.py', 'w') as f:
+    with open(CONFIG_FILE, 'w') as f:
         f.write(config_template)
     
-    print("✅ Создан файл конфигурации: docker-config.py")
+    print(f"✅ Создан файл конфигурации: {CONFIG_FILE}")
     print("📝 Отредактируйте его под ваши нужды.")
 
 
 def main():
     """Основная функция для CLI"""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='🚀 Универсальный скрипт для работы с Docker Buildx',
         formatter_class=argparse.RawTextHelpFormatter,
@@ -643,6 +1282,7 @@ def main():
   python3 docker-manager.py push --tag v1.0 --registry registry.example.com
   python3 docker-manager.py run --tag latest -p 8080:80 -d
   python3 docker-manager.py clean --all
+  python3 docker-manager.py batch plan.json
         """
     )
     
@@ -661,15 +1301,17 @@ def main():
     build_parser.add_argument('--builder', help='Имя builder\'а Buildx')
     build_parser.add_argument('--cache-to', help='Сохранять кэш сборки')
     build_parser.add_argument('--cache-from', help='Использовать кэш из указанного источника')
+    build_parser.add_argument('--no-auto-cache', action='store_false', dest='auto_cache', default=None,
+                              help='Не подставлять кэш сборки по умолчанию')
     
     # Push command
     push_parser = subparsers.add_parser('push', help='Отправка образа в реестр')
-    push_parser.add_argument('--tag', '-t', default='latest', help='Тег образа')
+    push_parser.add_argument('--tag', '-t', nargs='+', default=['latest'], help='Тег образа (можно несколько)')
     push_parser.add_argument('--registry', '-r', help='URL реестра')
     
     # Pull command
     pull_parser = subparsers.add_parser('pull', help='Скачивание образа из реестра')
-    pull_parser.add_argument('--tag', '-t', default='latest', help='Тег образа')
+    pull_parser.add_argument('--tag', '-t', nargs='+', default=['latest'], help='Тег образа (можно несколько)')
     pull_parser.add_argument('--registry', '-r', help='URL реестра')
     
     # Login command
@@ -714,8 +1356,15 @@ def main():
     # Init command
     init_parser = subparsers.add_parser('init', help='Создание шаблона конфигурации')
     
+    # Batch command
+    batch_parser = subparsers.add_parser('batch', help='Выполнение плана из нескольких операций')
+    batch_parser.add_argument('plan', help='JSON-файл со списком шагов (- для stdin), '
+                                           'например: [{"op": "build", "tag": "v1"}, {"op": "push", "tag": "v1"}]')
+    
     # Общие аргументы
     parser.add_argument('--quiet', '-q', action='store_true', help='Тихий режим')
+    parser.add_argument('--legacy-config', action='store_true',
+                        help=f'Читать конфигурацию из {LEGACY_CONFIG_FILE} вместо {CONFIG_FILE}')
     
     args = parser.parse_args()
     
@@ -723,8 +1372,13 @@ def main():
         parser.print_help()
         sys.exit(1)
     
+    # Для создания шаблона конфигурации менеджер (и проверка Buildx) не нужен
+    if args.command == 'init':
+        create_config_template()
+        sys.exit(0)
+    
     # Создание менеджера
-    manager = DockerManager(verbose=not args.quiet)
+    manager = DockerManager(verbose=not args.quiet, legacy_config=args.legacy_config)
     
     # Обработка команд
     success = True
@@ -743,14 +1397,21 @@ def main():
                 load=args.load,
                 builder=args.builder,
                 cache_to=args.cache_to,
-                cache_from=args.cache_from
+                cache_from=args.cache_from,
+                auto_cache=args.auto_cache
             )
             
         elif args.command == 'push':
-            success, output = manager.push(tag=args.tag, registry_url=args.registry)
+            if len(args.tag) == 1:
+                success, output = manager.push(tag=args.tag[0], registry_url=args.registry)
+            else:
+                success, output = manager.push_many(tags=args.tag, registry_url=args.registry)
             
         elif args.command == 'pull':
-            success, output = manager.pull(tag=args.tag, registry_url=args.registry)
+            if len(args.tag) == 1:
+                success, output = manager.pull(tag=args.tag[0], registry_url=args.registry)
+            else:
+                success, output = manager.pull_many(tags=args.tag, registry_url=args.registry)
             
         elif args.command == 'login':
             success, output = manager.login(
@@ -821,9 +1482,25 @@ def main():
         elif args.command == 'scan':
             success, output = manager.scan_image(tag=args.tag)
             
-        elif args.command == 'init':
-            create_config_template()
-            success = True
+        elif args.command == 'batch':
+            import json
+            try:
+                if args.plan == '-':
+                    plan = json.load(sys.stdin)
+                else:
+                    with open(args.plan, encoding='utf-8') as f:
+                        plan = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"❌ Не удалось прочитать план: {e}")
+                sys.exit(1)
+            
+            if not isinstance(plan, list):
+                print("❌ План должен быть JSON-списком шагов")
+                sys.exit(1)
+            
+            # Все шаги выполняются в одной сессии shell
+            with manager:
+                success, output = manager.run_batch(plan)
             
         else:
             print(f"Неизвестная команда: {args.command}")
@@ -2,82 +2,328 @@
 
 import re
 import os
+import sys
+import stat
+import functools
+from typing import Callable, Dict, FrozenSet, Iterator, NoReturn, Optional, TextIO, Tuple
 
+# Модуль можно собрать mypyc в расширение C (аннотации типов нужны для компиляции):
+#     cd scripts && mypyc yaml_parser.py
+# Собранный yaml_parser.<платформа>.so рядом со скриптом запускается вместо интерпретируемого кода.
 
-# Регулярные выражения для проверки структуры файла
-major_vers_pattern = r'^(\d+):$'  # Мажорная версия представлена числом (одна или более цифра), без отступа
-task_pattern = r'^  - task: '  # Шаблон любой строки, начинающийся с `  - task: ...`, отступ 2 пробела
-task_extended_pattern = r'^  - task: http(.+)$'  # Расширенный формат шаблона объявления задачи
-arch_pattern = r'^    arch: (stm32|avr|at32)(, (stm32|avr|at32))*$'  # Шаблон, описывающий строку с архитектурой. Пример совпадения: `    arch: stm32, avr`.
-task_type_pattern = r'^    (feature|bug|internal|info): \|$'  # Тип задачи - объявление многострочного описания, отступ 4 пробела
-description_initial_pattern = r'^      \S(.*)'  # Первая строка многострочного описания, отступ ровно 6 пробелов с последующим непробельным символом
-description_pattern = r'^      (.*)'  # Следующие строки описания (могут быть разделителем абзацев, т.е. 0 символов после отступа), отступ ровно 6 пробелов
-separator_pattern = r'^$'  # Пустая строка - разделитель между словарями категорий `- task` и/или `- release/prerelease`
 
-# В проекте ktr/modem есть релиз и предрелиз
-# Шаблон любой строки, начинающийся с `  - release: ...` или `  - prerelease: ...`, отступ 2 пробела
-release_pattern = r'^  - (release|prerelease): '
-# # Расширенный формат шаблона объявления объявления релиза/предрелиза,
-# после двоеточия пробел и число из одной и более цифры, отступ 2 пробела.
-# Пример совпадения: `  - prerelease: 123`
-release_extended_pattern = r'^  - (release|prerelease): (\d+)$'
+@functools.lru_cache(maxsize=None)
+def _compile(pattern: str) -> 're.Pattern[str]':
+    '''Компиляция составного шаблона (собранного из других шаблонов) один раз за процесс'''
+    return re.compile(pattern)
+
+
+# Регулярные выражения для проверки структуры файла (компилируются один раз при загрузке).
+# Значения полей не извлекаются, поэтому группы в шаблонах незахватывающие
+# Допустимые архитектуры и типы задач: из них собираются шаблоны ниже,
+# они же используются для построчной проверки без регулярных выражений
+ARCH_PREFIX = '    arch: '
+_ARCHES = frozenset({'stm32', 'avr', 'at32'})
+_TYPES = frozenset({'feature', 'bug', 'internal', 'info'})
+_arch_names = '(?:' + '|'.join(sorted(_ARCHES)) + ')'
+arch_pattern = re.compile('^' + ARCH_PREFIX + _arch_names + '(?:, ' + _arch_names + ')*$')  # Шаблон, описывающий строку с архитектурой. Пример совпадения: `    arch: stm32, avr`.
+task_type_pattern = re.compile(r'^    (?:' + '|'.join(sorted(_TYPES)) + r'): \|$')  # Тип задачи - объявление многострочного описания, отступ 4 пробела
 
 # Шаблон поля дата `    date: dd.mm.yy`, отступ 4 пробела 
-date_pattern = r'^    date: \d{2}\.\d{2}\.\d{2}$'  #
+date_pattern = re.compile(r'^    date: \d{2}\.\d{2}\.\d{2}$')  #
 # Шаблон поля зависимостей `    dependencies: []` или `    dependencies:`, отступ 4 пробела
-dependencies_pattern = r'^    dependencies:( \[\])*$'  #
+dependencies_pattern = re.compile(r'^    dependencies:(?: \[\])*$')  #
 # Шаблон поля base `    base: число` или `    base:`, отступ 4 пробела
 # Минорная версия предрелиза, ставшая релизом
-base_pattern = r'^    base: (\d+)*$'
+base_pattern = re.compile(r'^    base: \d*$')
 # Шаблон поля protocol `    protocol: число`, отступ 4 пробела
-protocol_pattern = r'^    protocol: (\d+)$'
-
+protocol_pattern = re.compile(r'^    protocol: \d+$')
 
-# Обёртка над функцией вывода
-def error(func):
-    def wrapper(*args):
-        # Префикс к каждому сообщению об ошибке
-        new_args = [f"ERROR of file structure at {args[0]}:\n{args[1]}\nExpected: {arg}"
-                    for arg in args[2:]]
-        return func(*new_args)
-    return wrapper
+# Проверка отступа: ровно 4 пробела перед непробельным символом
+indent4_pattern = re.compile(r'^    \S')
 
-
-# Декоратор к функции print
-@error
-def error_print(*args):
-    print(*args)
+# Строки без отступа и с отступом 2 пробела проверяются строковыми методами, без регулярных выражений:
+# - мажорная версия представлена числом (одна или более цифра) с двоеточием, без отступа: `12:`;
+# - пустая строка - разделитель между словарями категорий `- task` и/или `- release/prerelease`;
+# - объявление задачи - ссылка после префикса task: `  - task: http...`.
+# Шаблон любой строки, начинающийся с `  - task: ...`, отступ 2 пробела
+TASK_PREFIX = '  - task: '
+# В проекте ktr/modem есть релиз и предрелиз
+# Шаблон любой строки, начинающийся с `  - release: ...` или `  - prerelease: ...`, отступ 2 пробела.
+# В объявлении релиза/предрелиза после префикса число из одной и более цифры.
+# Пример совпадения: `  - prerelease: 123`
+RELEASE_PREFIXES = ('  - release: ', '  - prerelease: ')
+# Отступ описания: первая строка многострочного описания - ровно 6 пробелов с последующим
+# непробельным символом, следующие строки (могут быть разделителем абзацев, т.е. 0 символов
+# после отступа) - 6 пробелов и любые символы
+DESCRIPTION_INDENT = '      '
+
+# Виды строк с отступом 4 пробела (ключи словаря, кроме arch и типа задачи) в порядке приоритета:
+# строка относится к первому подходящему виду
+line_kinds: Tuple[Tuple[str, 're.Pattern[str]'], ...] = (
+    ('date', date_pattern),
+    ('dependencies', dependencies_pattern),
+    ('base', base_pattern),
+    ('protocol', protocol_pattern),
+    ('indent4', indent4_pattern),      # Прочие ключи с отступом 4 пробела
+)
+# Все шаблоны ключей в одном выражении: строка проверяется за один проход,
+# вид строки - имя совпавшей группы (Match.lastgroup)
+line_kind_pattern = _compile('|'.join(f'(?P<{kind}>{pattern.pattern[1:]})' for kind, pattern in line_kinds))
+# Виды строк, начинающихся ровно с 4 пробелов и непробельного символа
+indent4_kinds: FrozenSet[str] = frozenset(['arch', 'type'] + [kind for kind, _ in line_kinds])
+
+
+def _is_arch(string: str) -> bool:
+    '''Строка с архитектурой: `    arch: ` и перечисление архитектур через `, `'''
+    return string.startswith(ARCH_PREFIX) and all(arch in _ARCHES for arch in string[len(ARCH_PREFIX):].split(', '))
+
+
+def _is_task_type(string: str) -> bool:
+    '''Тип задачи: `    <тип>: |` (строка с отступом ровно 4 пробела)'''
+    return string.endswith(': |') and string[4:-3] in _TYPES
+
+
+def _is_desc_initial(string: str) -> bool:
+    '''Первая строка описания: ровно 6 пробелов и непробельный символ'''
+    return string.startswith(DESCRIPTION_INDENT) and len(string) > 6 and not string[6].isspace()
+
+
+def _is_desc_cont(string: str) -> bool:
+    '''Строка описания, не являющаяся первой строкой: 6 пробелов и любые символы'''
+    return string.startswith(DESCRIPTION_INDENT)
+
+
+def _line_pattern(pattern: 're.Pattern[str]') -> str:
+    '''Шаблон строки без якорей `^`/`$` и с переводом строки в конце (для шаблона блока)'''
+    return pattern.pattern[1:-1] + '\n'
+
+
+# Многострочное описание: первая строка и любое число следующих
+_description_lines = DESCRIPTION_INDENT + r'\S.*\n' + '(?:' + DESCRIPTION_INDENT + '.*\n)*'
+# Необязательные поля base в любом месте между date и protocol
+_base_lines = '(?:' + _line_pattern(base_pattern) + ')*'
+# Словарь категории целиком, от начальной строки до пустой строки-разделителя включительно,
+# в обычной форме: task - arch, тип и описание; release - date, dependencies, protocol и
+# необязательное описание info. Такой блок проверяется одним сопоставлением вместо построчного
+# разбора; блок другой формы (или с ошибкой) разбирается построчно с точным сообщением об ошибке
+block_pattern = _compile(
+    '(?:(?P<task_block>' + re.escape(TASK_PREFIX) + 'http.+\n'
+    + _line_pattern(arch_pattern) + _line_pattern(task_type_pattern) + _description_lines + ')'
+    + '|(?P<release_block>(?:' + '|'.join(map(re.escape, RELEASE_PREFIXES)) + ')\\d+\n'
+    + _line_pattern(date_pattern) + _base_lines + _line_pattern(dependencies_pattern) + _base_lines
+    + _line_pattern(protocol_pattern) + '(?:' + _line_pattern(task_type_pattern) + _description_lines + ')?'
+    + '))\n'
+)
+
+
+def line_kind(string: str) -> Optional[str]:
+    '''
+    Определяет вид строки или None, если строка не подходит ни к одному виду.
+
+    Без отступа: `major_ver`, `separator`; отступ 2 пробела: `task`, `release`,
+    `task_any` (`  - task: ` с неверной ссылкой), `release_any` (`  - release: ` с неверным номером),
+    `indent2` (прочие строки); отступ 4 пробела - виды из `line_kinds`;
+    отступ 6 и более пробелов: `description`, `description_cont`.
+    '''
+    indent = len(string) - len(string.lstrip(' '))
+    if indent == 0:
+        if string == '':
+            return 'separator'
+        if string[-1] == ':' and string[:-1].isdecimal():
+            return 'major_ver'
+        return None
+    if indent == 2:
+        if string.startswith(TASK_PREFIX):
+            # После `http` хотя бы один символ
+            return 'task' if string.startswith('http', len(TASK_PREFIX)) and len(string) > len(TASK_PREFIX) + 4 else 'task_any'
+        for prefix in RELEASE_PREFIXES:
+            if string.startswith(prefix):
+                return 'release' if string[len(prefix):].isdecimal() else 'release_any'
+        return 'indent2' if len(string) > 2 and not string[2].isspace() else None
+    if indent == 4:
+        if _is_arch(string):
+            return 'arch'
+        if _is_task_type(string):
+            return 'type'
+        match = line_kind_pattern.match(string)
+        return match.lastgroup if match else None
+    if indent >= 6:
+        if _is_desc_initial(string):
+            return 'description'
+        if _is_desc_cont(string):
+            return 'description_cont'
+    return None  # Нечётный отступ (1, 3 или 5 пробелов) не подходит ни к одному виду
+
+
+# Флаги состояния парсера (биты поля YamlParser.flags)
+F_MAJOR = 1 << 0    # Прочитан номер мажорной версии
+F_TASK = 1 << 1     # Читается словарь категории task
+F_ARCH = 1 << 2     # Прочитано поле arch
+F_TYPE = 1 << 3     # Прочитан тип (feature/bug/internal/info)
+F_DESC = 1 << 4     # Прочитана первая строка описания
+F_RELEASE = 1 << 5  # Читается словарь категории release
+F_DATE = 1 << 6     # Прочитано поле date
+F_DEPS = 1 << 7     # Прочитано поле dependencies
+F_BASE = 1 << 8     # Прочитано поле base
+F_PROTO = 1 << 9    # Прочитано поле protocol
+# Флаги, сбрасываемые по окончании словаря release
+F_RELEASE_ALL = F_RELEASE | F_DATE | F_DEPS | F_BASE | F_PROTO | F_DESC | F_TYPE
+# Флаги, сбрасываемые по окончании словаря task
+F_ALL = (F_PROTO << 1) - 1
+# Флаги, определяющие состояние автомата (F_MAJOR и F_BASE на переходы не влияют)
+STATE_MASK = F_ALL & ~(F_MAJOR | F_BASE)
+
+# Состояния автомата (значения `flags & STATE_MASK`)
+S_INIT = 0                                     # Ожидается `  - task: ...` или `  - release: ...`
+S_TASK = F_TASK                                # Ожидается arch
+S_TASK_ARCH = S_TASK | F_ARCH                  # Ожидается тип задачи
+S_TASK_TYPE = S_TASK_ARCH | F_TYPE             # Ожидается первая строка описания
+S_TASK_DESC = S_TASK_TYPE | F_DESC             # Описание задачи, пустая строка завершает словарь
+S_RELEASE = F_RELEASE                          # Ожидается date
+S_RELEASE_DATE = S_RELEASE | F_DATE            # Ожидается dependencies (base необязателен)
+S_RELEASE_DEPS = S_RELEASE_DATE | F_DEPS       # Ожидается protocol
+S_RELEASE_PROTO = S_RELEASE_DEPS | F_PROTO     # Необязательное поле info, пустая строка завершает словарь
+S_RELEASE_TYPE = S_RELEASE_PROTO | F_TYPE      # Ожидается первая строка описания
+S_RELEASE_DESC = S_RELEASE_TYPE | F_DESC       # Описание релиза, пустая строка завершает словарь
+
+# Переходы автомата: (состояние, вид строки) -> (сбрасываемые флаги, устанавливаемые флаги).
+# Пара отсутствует в таблице - строка не соответствует формату
+STAY = (0, 0)
+TRANSITIONS: Dict[Tuple[int, Optional[str]], Tuple[int, int]] = {(state, 'major_ver'): (0, F_MAJOR) for state in (
+    S_INIT, S_TASK, S_TASK_ARCH, S_TASK_TYPE, S_TASK_DESC,
+    S_RELEASE, S_RELEASE_DATE, S_RELEASE_DEPS, S_RELEASE_PROTO, S_RELEASE_TYPE, S_RELEASE_DESC)}
+TRANSITIONS.update({
+    (S_INIT, 'task'): (0, F_TASK),
+    (S_INIT, 'release'): (0, F_RELEASE),
+    # Словарь task: arch, тип задачи и многострочное описание
+    (S_TASK, 'arch'): (0, F_ARCH),
+    (S_TASK_ARCH, 'arch'): STAY,
+    (S_TASK_ARCH, 'type'): (0, F_TYPE),
+    (S_TASK_TYPE, 'arch'): STAY,
+    (S_TASK_TYPE, 'type'): STAY,
+    (S_TASK_TYPE, 'description'): (0, F_DESC),
+    (S_TASK_DESC, 'arch'): STAY,
+    (S_TASK_DESC, 'type'): STAY,
+    (S_TASK_DESC, 'description'): STAY,
+    (S_TASK_DESC, 'description_cont'): STAY,
+    (S_TASK_DESC, 'separator'): (F_ALL, 0),
+    # Словарь release: date, dependencies (base), protocol и необязательное описание info
+    (S_RELEASE, 'date'): (0, F_DATE),
+})
+for state in (S_RELEASE_DATE, S_RELEASE_DEPS, S_RELEASE_PROTO, S_RELEASE_TYPE, S_RELEASE_DESC):
+    # Поля date, dependencies и base могут повторяться в любом месте словаря
+    TRANSITIONS[state, 'date'] = STAY
+    TRANSITIONS[state, 'base'] = (0, F_BASE)
+    TRANSITIONS[state, 'dependencies'] = (0, F_DEPS)
+for state in (S_RELEASE_DEPS, S_RELEASE_PROTO, S_RELEASE_TYPE, S_RELEASE_DESC):
+    TRANSITIONS[state, 'protocol'] = (0, F_PROTO)
+for state in (S_RELEASE_PROTO, S_RELEASE_TYPE, S_RELEASE_DESC):
+    TRANSITIONS[state, 'type'] = (0, F_TYPE)
+    TRANSITIONS[state, 'separator'] = (F_RELEASE_ALL, 0)
+TRANSITIONS.update({
+    # После protocol прочие ключи с отступом 4 пробела допускаются без проверки
+    (S_RELEASE_PROTO, 'arch'): STAY,
+    (S_RELEASE_PROTO, 'indent4'): STAY,
+    (S_RELEASE_TYPE, 'description'): (0, F_DESC),
+    (S_RELEASE_DESC, 'description'): STAY,
+    (S_RELEASE_DESC, 'description_cont'): STAY,
+})
+
+# Ожидаемый формат строки, если перехода нет
+EXPECTED: Dict[int, str] = {
+    S_INIT: "2 spaces `  ` before {task,release}",
+    S_TASK: "`    arch: {stm32,avr,at32}`",
+    S_TASK_ARCH: "`    {feature,bug,internal}: |`",
+    S_TASK_TYPE: "`      <description>`",
+    S_TASK_DESC: "`      <description>`",
+    S_RELEASE: "`    date: <dd.mm.yy>`",
+    S_RELEASE_DATE: "`    dependencies:`",
+    S_RELEASE_DEPS: "`    protocol: <number-of-protocol>`",
+    S_RELEASE_PROTO: "indent 4 spaces `    `",
+    S_RELEASE_TYPE: "`      <description>`",
+    S_RELEASE_DESC: "`      <description>`",
+}
+# Уточнение ожидаемого формата для начальной строки словаря
+EXPECTED_INITIAL: Dict[Optional[str], str] = {
+    'task_any': "`  - task: <link-to-task>`",
+    'release_any': "`  - release: <minor-version-number>`",
+    'indent2': "`  - {task,release}:`",
+}
+# Состояния, в которых строка должна быть ключом словаря с отступом 4 пробела (или разделителем)
+INDENT4_STATES: FrozenSet[int] = frozenset({S_TASK, S_TASK_ARCH, S_RELEASE, S_RELEASE_DATE, S_RELEASE_DEPS, S_RELEASE_PROTO})
+
+
+def expected_format(state: int, kind: Optional[str]) -> str:
+    '''Ожидаемый формат строки вида `kind`, для которой нет перехода из состояния `state`'''
+    if state == S_INIT:
+        return EXPECTED_INITIAL.get(kind, EXPECTED[S_INIT])
+    if state in INDENT4_STATES and kind not in indent4_kinds and kind != 'separator':
+        return "indent 4 spaces `    `"
+    return EXPECTED[state]
+
+
+class YamlStructureError(Exception):
+    '''Нарушение структуры файла: место в файле, ошибочная строка и ожидаемый формат'''
+    __slots__ = ('where', 'line_repr', 'expected')
+    where: str
+    line_repr: str
+    expected: str
+
+    def __init__(self, where: str, line_repr: str, expected: str) -> None:
+        super().__init__(where, line_repr, expected)
+        self.where = where
+        self.line_repr = line_repr
+        self.expected = expected
+
+    def __str__(self) -> str:
+        return _format_error(self.where, self.line_repr, self.expected)
+
+
+# Сообщение об ошибке: место в файле, ошибочная строка и ожидаемый формат
+def _format_error(where: str, line_repr: str, expected: str) -> str:
+    return f"ERROR of file structure at {where}:\n{line_repr}\nExpected: {expected}"
+
+
+# Вывод сообщения об ошибке
+def _emit_error(where: str, line_repr: str, expected: str) -> None:
+    print(_format_error(where, line_repr, expected))
+
+
+# Наибольший размер файла, читаемого из stdin целиком и разбираемого блоками
+# (пиковая память - около двух размеров файла); больший файл читается построчно
+READ_ALL_LIMIT = 256 * 1024 * 1024
 
 
 # Класс парсера ченжлога
 class YamlParser:
-    def __init__(self):
+    # Фиксированный набор полей экземпляра, без __dict__
+    __slots__ = ('line_number', 'flags', 'source_name')
+    line_number: int
+    flags: int
+    source_name: str
+
+    def __init__(self) -> None:
         self.line_number = 0  # Номер строки в читаемом файле
+        # Имя читаемого файла для сообщений об ошибках (не меняется за время работы)
+        try:
+            self.source_name = os.readlink('/proc/self/fd/0')
+        except OSError:  # Нет /proc (не Linux)
+            self.source_name = '<stdin>'
         self.reset_state()
 
-    def reset_state(self):
+    def reset_state(self) -> None:
         '''Сброс состояния флагов'''
-        # Флаги для индикации состояния парсера
-        self.state = {
-            'major_ver': False,
-            'task': False,
-            'arch': False,
-            'type': False,
-            'description': False,
-            'release': False,
-            'date': False,
-            'dependencies': False,
-            'base': False,
-            'protocol': False
-        }
+        self.flags = 0  # Флаги для индикации состояния парсера (F_*)
 
     # Парсинг прочитанной строки
-    def parse_line(self, string):
+    def parse_line(self, string: str) -> None:
         '''
         Парсит строку и обновляет состояние флагов.
 
-        В зависимости от формата строки и состояния флагов, обновляет внутренние флаги и
-        вызывает соответствующие методы для дальнейшего парсинга.
+        Вид строки определяется одним проходом `line_kind`, переход - по таблице `TRANSITIONS`
+        для текущего состояния. Если перехода нет, метод `raise_error` выбрасывает
+        `YamlStructureError` с ожидаемым форматом строки.
         Если это не номер мажорной версии, то либо это словарь категории описания задачи (- task), либо релиза (- release)
 
         Параметры:
@@ -85,228 +331,129 @@ class YamlParser:
         string : str
             Строка, которую необходимо проверить на соответствие формату.
         '''
-        if re.match(major_vers_pattern, string):
-            self.state['major_ver'] = True
-        elif not self.state['task'] and not self.state['release']:
-            self.parse_initial(string)
-        elif self.state['task']:
-            self.parse_task(string)
-        elif self.state['release']:
-            self.parse_release(string)
-
-    def parse_initial(self, string):
+        state = self.flags & STATE_MASK
+        kind = line_kind(string)
+        transition = TRANSITIONS.get((state, kind))
+        if transition is None:
+            self.raise_error(string, expected_format(state, kind))
+        clear, set_flags = transition
+        self.flags = self.flags & ~clear | set_flags
+
+    def parse_text(self, text: str) -> None:
         '''
-        Парсит начальную строку в объявлении словаря категории task или release и обновляет состояние.
+        Парсит текст файла целиком.
 
-        В зависимости от формата строки, устанавливает соответствующие флаги (`task` или `release`).
-        Если строка не соответствует ни одному из ожидаемых форматов,
-        вызывается метод `validate_initial` для проверки корректности строки.
+        Если парсер ожидает начало словаря категории, а с текущей строки начинается блок
+        в обычной форме (`block_pattern`), блок принимается одним сопоставлением; иначе
+        текущая строка разбирается методом `parse_line`. Результат тот же, что при
+        построчном разборе всего текста.
 
         Параметры:
         ----------
-        string : str
-            Строка, которую необходимо проверить на соответствие формату.
-
-        Исключения:
-        -----------
-        Вызывает метод `validate_initial`, если строка не соответствует формату задачи
-        или релиза.
+        text : str
+            Текст файла; строки разделены `\\n`, перевод строки в конце не образует новую строку.
         '''
-        if re.match(task_extended_pattern, string):
-            self.state['task'] = True
-        elif re.match(release_extended_pattern, string):
-            self.state['release'] = True
-        else:
-            self.validate_initial(string)  # Если не найдено соответствий (task, release)
+        pos, end = 0, len(text)
+        line_number = 0
+        while pos < end:
+            if self.flags & STATE_MASK == S_INIT:
+                match = block_pattern.match(text, pos)
+                if match is not None:
+                    if match.lastgroup == 'task_block':
+                        self.flags = 0  # Пустая строка в конце словаря task сбрасывает все флаги
+                    block_end = match.end()
+                    line_number += text.count('\n', pos, block_end)
+                    pos = block_end
+                    continue
+            eol = text.find('\n', pos)
+            if eol < 0:  # Последняя строка без перевода строки
+                eol = end
+            line_number += 1
+            self.line_number = line_number
+            self.parse_line(text[pos:eol])
+            pos = eol + 1
+
+    # Сообщить об ошибке с указанием номера строки
+    def raise_error(self, line: str, message: str) -> NoReturn:
+        raise YamlStructureError(f'{self.source_name}, line {self.line_number}', f"`{line}`", message)
+
+
+def _stdin_size() -> Optional[int]:
+    '''Размер stdin, если это обычный файл (`< changelog.yaml`), иначе None (канал, терминал)'''
+    try:
+        st = os.fstat(sys.stdin.fileno())
+    except (AttributeError, OSError, ValueError):
+        return None
+    return st.st_size if stat.S_ISREG(st.st_mode) else None
 
-    # Выявление ошибки
-    def validate_initial(self, string):
-        '''
-        Проверяет корректность начальной строки в объявлении словаря категории task или release
-        Строка должна начинаться с двух пробелов и соответствует одному из следующих шаблонов:
-        - `  - task: <link-to-task>`
-        - `  - release: <minor-version-number>`
 
-        Если строка не соответствует этим критериям, вызывается метод `raise_error`
-        с соответствующим сообщением об ошибке.
+def read_text(stream: TextIO) -> Optional[str]:
+    '''
+    Текст потока, если это обычный файл размером не более `READ_ALL_LIMIT`
+    (читается целиком одним вызовом), иначе None.
+    '''
+    size = _stdin_size() if stream is sys.stdin else None
+    if size is None or size > READ_ALL_LIMIT:
+        return None
+    return stream.buffer.read().decode(stream.encoding, stream.errors or 'strict')
 
-        Параметры:
-        ----------
-        string : str
-            Строка, которую необходимо проверить на соответствие формату.
-
-        Исключения:
-        -----------
-        Вызывает метод `raise_error`, если строка не соответствует требованиям:
-            - Неправильный отступ (не 2 пробела перед задачей или релизом).
-            - Неверный формат задачи или релиза.
-        '''
-        if not re.match(r'^  \S', string):  # Неправильный отступ для категории
-            self.raise_error(string, "2 spaces `  ` before {task,release}")
-        if not re.match(task_pattern, string) and not re.match(release_pattern, string):
-            self.raise_error(string, "`  - {task,release}:`")
-        elif re.match(task_pattern, string):
-            self.raise_error(string, "`  - task: <link-to-task>`")
-        elif re.match(release_pattern, string):
-            self.raise_error(string, "`  - release: <minor-version-number>`")
-
-    # Чтение словаря категории task
-    def parse_task(self, string):
-        '''
-        Парсит строку, представляющую задачу и обновляет состояние флагов.
 
-        Проверяет отступы, архитектуру (arch), тип задачи и описание,
-        В случае обнаружения ошибок вызывается метод `raise_error`.
+def read_lines(stream: TextIO) -> Iterator[str]:
+    '''Возвращает строки потока без завершающего перевода строки'''
+    # Итерация по буферизованному потоку вместо вызова input() на каждую строку
+    return (line.rstrip('\n') for line in stream)
 
-        Параметры:
-        ----------
-        string : str
-            Строка, которую необходимо проанализировать как задачу.
-
-        Исключения:
-        -----------
-        Вызывает метод `raise_error`, если строка не соответствует требованиям:
-            - Неправильный отступ (не 4 пробела).
-            - Отсутствие или неверный формат архитектуры.
-            - Отсутствие или неверный формат типа задачи.
-            - Отсутствие или неверный формат описания.
-        '''
-        # Проверка на отступ (текущая строка является ключом в словаре и
-        # не является описанием (значение поля feature/bug/internal/info)
-        # или разделителем словарей - пустой строкой)
-        if not re.match(r'^    \S', string) and \
-            not self.state['type'] and \
-                not re.match(separator_pattern, string):
-            self.raise_error(string, "indent 4 spaces `    `")
-
-        if re.match(arch_pattern, string):
-            self.state['arch'] = True
-            return
-        elif not self.state['arch']:
-            self.raise_error(string, "`    arch: {stm32,avr,at32}`")
-
-        if self.state['arch']:
-            if re.match(task_type_pattern, string):
-                self.state['type'] = True
-                return
-            elif not self.state['type']:
-                self.raise_error(string, "`    {feature,bug,internal}: |`")
-
-            if self.state['type']:
-                # Если прочитана пустая строка, то
-                # словарь task закончился => сброс состояния
-                if re.match(separator_pattern, string) and self.state['description']:
-                    self.reset_state()
-                    return
-
-                if re.match(description_initial_pattern, string):
-                    self.state['description'] = True
-                    return
-                elif self.state['description'] and re.match(description_pattern, string):
-                    return
-                else:
-                    self.raise_error(string, "`      <description>`")
-
-    def parse_release(self, string):
-        '''
-        Расширяет функциональность базового метода `parse_release`, добавляя
-        дополнительные проверки для полей типа, протокола и описания.
 
-        Параметры:
-        ----------
-        string : str
-            Входная строка, представляющая строку информации о релизе, соответствующая определённому
-            формату с отступами и обязательными/необязательными полями.
-
-        Исключения:
-        -----------
-        Вызывает метод `raise_error`, если строка не соответствует требованиям:
-            - Неправильный отступ (не 4 пробела).
-            - Отсутствие даты или неверный формат даты.
-            - Отсутствие зависимостей после указания даты.
-            - Отсутствие протокола после указания зависимостей.
-            - Неверный формат описания, если оно есть.
-        '''
-        if not re.match(r'^    \S', string) and \
-            not self.state['type'] and \
-                not re.match(separator_pattern, string):
-            self.raise_error(string, "indent 4 spaces `    `")
-
-        if re.match(date_pattern, string):
-            self.state['date'] = True
-            return
-        elif not self.state['date']:
-            self.raise_error(string, "`    date: <dd.mm.yy>`")
-
-        if self.state['date']:
-            if re.match(dependencies_pattern, string):
-                self.state['dependencies'] = True
-                return
-            elif re.match(base_pattern, string):  # Необязательное поле base
-                self.state['base'] = True
-                return
-            elif not self.state['dependencies']:
-                self.raise_error(string, "`    dependencies:`")
-
-            if self.state['dependencies']:
-                if re.match(protocol_pattern, string):  # Обязательное поле protocol
-                    self.state['protocol'] = True
-                    return
-                elif not self.state['protocol']:
-                    self.raise_error(string, "`    protocol: <number-of-protocol>`")
-
-                if self.state['protocol']:
-                    # Если в словаре - release есть необязательное поле info с многострочным описанием
-                    if re.match(task_type_pattern, string):
-                        self.state['type'] = True
-                        return
-                    else:
-                        if re.match(separator_pattern, string):
-                            self.reset_release_state()
-
-                    if self.state['type']:
-                        if re.match(separator_pattern, string) and self.state['description']:
-                            self.reset_release_state()
-                            return
-
-                        if re.match(description_initial_pattern, string):
-                            self.state['description'] = True
-                            return
-                        elif self.state['description'] and re.match(description_pattern, string):
-                            return
-                        else:
-                            self.raise_error(string, "`      <description>`")
-
-    # Сброс состояния флагов
-    def reset_release_state(self):
-        for key in ['release', 'date', 'dependencies', 'base', 'protocol', 'description', 'type']:
-            self.state[key] = False
-
-    # Установить номер текущей строки
-    def set_current_line_number(self, number: int):
-        self.line_number = number
-
-    # Вывести лог об ошибке с указанием номера строки
-    def raise_error(self, line: str, message: str):
-        error_print(os.readlink('/proc/self/fd/0') + f', line {self.line_number}', f"`{line}`", message)
-        exit(1)
-
-
-def parse_yaml():
-    parser = ModemYamlParser()
+def parse_yaml() -> None:
+    parser = YamlParser()
 
+    # Считываение построчно из stdin (changelog.yaml)
+    # ./yaml_parser.py < changelog.yaml
     try:
-        enumerator = 0
-        while True:
-            enumerator += 1
-            # Считываение построчно из stdin (changelog.yaml)
-            # ./yaml_parser.py < changelog.yaml
-            line = input()
-            parser.set_current_line_number(enumerator)
-            parser.parse_line(line)
-    except EOFError:
+        text = read_text(sys.stdin)
+        if text is not None:
+            parser.parse_text(text)
+        else:
+            # Номер текущей строки записывается в парсер прямо в заголовке цикла
+            for parser.line_number, line in enumerate(read_lines(sys.stdin), 1):
+                parser.parse_line(line)
         print("Parsed successfully!")
+    except YamlStructureError as e:
+        _emit_error(e.where, e.line_repr, e.expected)
+        sys.exit(1)
+    finally:
+        # Буферизованный вывод сбрасывается один раз, при завершении разбора
+        sys.stdout.flush()
+
+
+def _compiled_parse_yaml() -> Optional[Callable[[], None]]:
+    '''
+    parse_yaml из собранного mypyc модуля рядом со скриптом или None, если модуль
+    не собран или собран из более старой версии скрипта
+    '''
+    import importlib
+    import importlib.machinery
+    source = os.path.abspath(__file__)
+    directory = os.path.dirname(source)
+    source_mtime = os.stat(source).st_mtime
+    # Суффиксы перебираются в порядке импорта: проверяется модуль, который будет загружен
+    for suffix in importlib.machinery.EXTENSION_SUFFIXES:
+        try:
+            module_mtime = os.stat(os.path.join(directory, 'yaml_parser' + suffix)).st_mtime
+        except OSError:  # Модуль с этим суффиксом не собран
+            continue
+        if module_mtime < source_mtime:  # Скрипт изменён после сборки
+            return None
+        break
+    else:
+        return None
+    try:
+        compiled: Callable[[], None] = importlib.import_module('yaml_parser').parse_yaml
+    except ImportError:  # Модуль собран для другой версии Python
+        return None
+    return compiled
 
 
 if __name__ == "__main__":
-    parse_yaml()
+    main = _compiled_parse_yaml() or parse_yaml
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# Тесты менеджера Docker: python3 -m unittest discover -s tests
+
+import importlib.util
+import io
+import os
+import sys
+import unittest
+from typing import Dict, List, Optional
+from unittest import mock
+
+_spec = importlib.util.spec_from_file_location(
+    'docker_manager', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'docker-manager.py'))
+docker_manager = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(docker_manager)
+
+
+def python_command(code):
+    '''Команда, выполняющая код на Python (вместо docker)'''
+    return [sys.executable, '-c', code]
+
+
+# Вывод с байтами, которые не декодируются как UTF-8
+INVALID_UTF8 = python_command(r"import sys; sys.stdout.buffer.write(b'before\n\377\376\nafter\n')")
+
+
+class StreamingTest(unittest.TestCase):
+
+    def test_invalid_utf8_output(self):
+        manager = docker_manager.DockerManager(verbose=False)
+        self.assertEqual(manager.run_command_streaming(INVALID_UTF8), (True, None))
+        # Хвост вывода возвращается при ошибке
+        failing = [INVALID_UTF8[0], '-c', INVALID_UTF8[2] + '; sys.exit(1)']
+        self.assertEqual(manager.run_command_streaming(failing), (False, 'before\n��\nafter\n'))
+
+    def test_invalid_utf8_output_verbose(self):
+        manager = docker_manager.DockerManager(verbose=True)
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            self.assertEqual(manager.run_command_streaming(INVALID_UTF8), (True, None))
+        self.assertIn('before\n��\nafter\n', stdout.getvalue())
+
+    def test_tail_lines(self):
+        manager = docker_manager.DockerManager(verbose=False)
+        command = python_command('import sys; print(*range(5), sep=chr(10)); sys.exit(2)')
+        self.assertEqual(manager.run_command_streaming(command, tail_lines=2), (False, '3\n4\n'))
+        # В подробном режиме вывод уже показан и не возвращается
+        manager.verbose = True
+        with mock.patch('sys.stdout', new_callable=io.StringIO):
+            self.assertEqual(manager.run_command_streaming(command), (False, None))
+
+
+class SessionTest(unittest.TestCase):
+
+    def test_invalid_utf8_captured(self):
+        with docker_manager.DockerManager(verbose=False) as manager:
+            self.assertEqual(manager.run_command(INVALID_UTF8, capture_output=True),
+                             (True, 'before\n��\nafter\n'))
+            # Маркер прочитан: следующая команда сессии получает только свой вывод
+            self.assertEqual(manager.run_command(python_command('print(1)'), capture_output=True),
+                             (True, '1\n'))
+
+    def test_invalid_utf8_streamed(self):
+        with docker_manager.DockerManager(verbose=False) as manager:
+            with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+                self.assertEqual(manager.run_command(INVALID_UTF8), (True, None))
+            self.assertEqual(stdout.getvalue(), 'before\n��\nafter\n')
+
+    def test_stderr_kept_out_of_output(self):
+        script = "import sys; print('out'); sys.stderr.write('err\\n'); sys.exit(int(sys.argv[1]))"
+        with docker_manager.DockerManager(verbose=False) as manager:
+            self.assertEqual(manager.run_command(python_command(script) + ['0'], capture_output=True),
+                             (True, 'out\n'))
+            self.assertEqual(manager.run_command(python_command(script) + ['3'], capture_output=True),
+                             (False, 'err\n'))
+
+
+
+class RunManyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = docker_manager.DockerManager(verbose=False)
+        self.manager._config = dict(docker_manager._CONFIG_DEFAULTS)
+        self.calls = []
+
+    def operation(self, tag, registry_url):
+        self.calls.append(tag)
+        return tag != 'bad', f'{tag} failed\n'
+
+    def test_duplicates_and_failed_outputs(self):
+        success, output = self.manager._run_many(self.operation, ['v1', 'bad', 'v1'], 'r.io', None)
+        self.assertFalse(success)
+        self.assertEqual(sorted(self.calls), ['bad', 'v1'])
+        self.assertEqual(output, 'bad:\nbad failed')
+
+    def test_string_tags_rejected(self):
+        self.assertEqual(self.manager._run_many(self.operation, 'v1', 'r.io', None), (False, None))
+        self.assertEqual(self.calls, [])
+
+    def test_invalid_parallel_push(self):
+        self.manager._config['parallel_push'] = 'x'
+        self.assertEqual(self.manager._parallel_max_workers(None),
+                         docker_manager._CONFIG_DEFAULTS['parallel_push'])
+        self.assertTrue(self.manager._run_many(self.operation, ['v1', 'v2'], 'r.io', None)[0])
+
+    def test_parallel_push_from_environment(self):
+        self.manager._config['parallel_push'] = '3'
+        self.assertEqual(self.manager._parallel_max_workers(None), 3)
+        self.assertEqual(self.manager._parallel_max_workers(0), 1)
+
+
+
+class RunBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = docker_manager.DockerManager(verbose=False)
+        self.calls = []
+        # Операции заменяются заглушками с теми же сигнатурами, docker не запускается
+        self.manager.push = self.push
+        self.manager.push_many = self.push_many
+        self.manager.run_container = self.run_container
+
+    def push(self, tag: Optional[str] = None, registry_url: Optional[str] = None):
+        self.calls.append(('push', tag))
+        return tag != 'bad', f'pushed {tag}'
+
+    def push_many(self, tags: List[str], registry_url: Optional[str] = None, max_workers: Optional[int] = None):
+        self.calls.append(('push_many', tags))
+        return True, None
+
+    def run_container(self, image_tag: str, ports: Optional[Dict] = None, env: Optional[Dict] = None):
+        self.calls.append(('run', image_tag))
+        return True, 'ran'
+
+    def test_outputs_joined(self):
+        plan = [{'op': 'push', 'tag': 'v1'}, {'op': 'push_many', 'tags': ['a']}, {'op': 'run', 'image_tag': 'i'}]
+        self.assertEqual(self.manager.run_batch(plan), (True, 'pushed v1\nran'))
+        self.assertEqual(self.calls, [('push', 'v1'), ('push_many', ['a']), ('run', 'i')])
+
+    def test_stops_on_first_failure(self):
+        plan = [{'op': 'push', 'tag': 'v1'}, {'op': 'push', 'tag': 'bad'}, {'op': 'push', 'tag': 'v2'}]
+        self.assertEqual(self.manager.run_batch(plan), (False, 'pushed v1\npushed bad'))
+        self.assertEqual(self.calls, [('push', 'v1'), ('push', 'bad')])
+
+    def test_invalid_steps(self):
+        invalid = [
+            ['push'],                                               # Шаг не объект
+            [{'tag': 'v1'}],                                        # Нет op
+            [{'op': 'deploy'}],                                     # Неизвестная операция
+            [{'op': 'push', 'bogus': 1}],                           # Неизвестный аргумент
+            [{'op': 'run'}],                                        # Пропущен обязательный аргумент
+            [{'op': 'push_many', 'tags': 'v1'}],                    # Строка вместо списка
+            [{'op': 'run', 'image_tag': 'i', 'ports': ['80:80']}],  # Список вместо объекта
+        ]
+        for plan in invalid:
+            with self.subTest(plan=plan):
+                self.assertEqual(self.manager.run_batch([{'op': 'push', 'tag': 'v1'}] + plan),
+                                 (False, 'pushed v1'))
+        self.assertEqual(self.calls, [('push', 'v1')] * len(invalid))
+
+    def test_none_for_optional_arguments(self):
+        plan = [{'op': 'run', 'image_tag': 'i', 'ports': None, 'env': {'A': '1'}}]
+        self.assertEqual(self.manager.run_batch(plan), (True, 'ran'))
+
+    def test_error_inside_operation_propagates(self):
+        self.manager.push = mock.Mock(side_effect=TypeError('bug'))
+        with self.assertRaises(TypeError):
+            self.manager.run_batch([{'op': 'push'}])
+
+
+
+# Вывод `docker buildx ls`: (описание, вывод, имена builder'ов, текущий builder)
+BUILDX_LS = [
+    ('columns, active multiarch',
+     'NAME/NODE       DRIVER/ENDPOINT             STATUS  BUILDKIT PLATFORMS\n'
+     'multiarch *     docker-container\n'
+     '  multiarch0    unix:///var/run/docker.sock running v0.12.5  linux/amd64, linux/arm64\n'
+     'default         docker\n'
+     '  default       default                     running 24.0.7   linux/amd64\n',
+     {'multiarch', 'default'}, 'multiarch'),
+    ('columns, active default',
+     'NAME/NODE       DRIVER/ENDPOINT             STATUS  BUILDKIT PLATFORMS\n'
+     'multiarch       docker-container\n'
+     '  multiarch0    unix:///var/run/docker.sock stopped\n'
+     'default *       docker\n'
+     '  default       default                     running 24.0.7   linux/amd64\n',
+     {'multiarch', 'default'}, 'default'),
+    ('tree, active multiarch',
+     'NAME/NODE           DRIVER/ENDPOINT                   STATUS    BUILDKIT   PLATFORMS\n'
+     'multiarch*          docker-container\n'
+     ' \\_ multiarch0       \\_ unix:///var/run/docker.sock   running   v0.13.2    linux/amd64\n'
+     'default             docker\n'
+     ' \\_ default          \\_ default                       running   v0.13.2    linux/amd64\n',
+     {'multiarch', 'default'}, 'multiarch'),
+    ('tree, several nodes',
+     'NAME/NODE           DRIVER/ENDPOINT                   STATUS    BUILDKIT   PLATFORMS\n'
+     'remote              remote\n'
+     ' \\_ remote0          \\_ tcp://10.0.0.1:1234         running   v0.13.2    linux/amd64\n'
+     ' \\_ remote1          \\_ tcp://10.0.0.2:1234         running   v0.13.2    linux/arm64\n'
+     'default*            docker\n'
+     ' \\_ default          \\_ default                       running   v0.13.2    linux/amd64\n',
+     {'remote', 'default'}, 'default'),
+    ('no active builder, trailing empty line',
+     'NAME/NODE DRIVER/ENDPOINT STATUS\n'
+     'default   docker\n'
+     '  default default         running\n'
+     '\n',
+     {'default'}, None),
+    ('header only', 'NAME/NODE DRIVER/ENDPOINT STATUS\n', set(), None),
+]
+
+
+class StoreBuildersTest(unittest.TestCase):
+
+    def test_buildx_ls_layouts(self):
+        manager = docker_manager.DockerManager(verbose=False)
+        for description, output, builders, active in BUILDX_LS:
+            with self.subTest(description):
+                manager._store_builders(output)
+                self.assertEqual(manager._builders_cache, builders)
+                self.assertEqual(manager._active_builder, active)
+
+
+if __name__ == '__main__':
+    unittest.main()
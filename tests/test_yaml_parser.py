@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# Тесты парсера ченжлога: python3 -m unittest discover -s tests
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import yaml_parser  # noqa: E402
+
+
+VALID_TASK = [
+    '  - task: https://jira.example.com/browse/KTR-123',
+    '    arch: stm32, avr',
+    '    feature: |',
+    '      Added something',
+    '       more text',
+    '',
+]
+
+VALID_RELEASE = [
+    '  - release: 5',
+    '    date: 01.02.24',
+    '    base: 4',
+    '    dependencies: []',
+    '    protocol: 3',
+    '    info: |',
+    '      note',
+    '',
+]
+
+# Строки для случайных документов: корректные и с типичными ошибками
+LINES = [
+    '12:', '  - task: https://a/b', '  - task: http', '  - task: htt',
+    '    arch: stm32', '    arch: stm32, avr', '    arch: x86', '    arch: avr,at32',
+    '    feature: |', '    bug: |', '    internal: |', '    info: |', '    bug:|',
+    '      desc', '      ', '       more', '      \tx', '      d\r',
+    '  - release: 5', '  - prerelease: 6', '  - release: x',
+    '    date: 01.02.24', '    date: 1.2.24', '    dependencies: []', '    dependencies:',
+    '    base: 4', '    base:', '    protocol: 3', '    protocol:',
+    '', '    other: 1', '   three', '  \tx', 'x', '\r',
+]
+
+
+def parse(text, blocks):
+    '''Результат разбора текста: ('ok', флаги) или сообщение об ошибке'''
+    parser = yaml_parser.YamlParser()
+    try:
+        if blocks:
+            parser.parse_text(text)
+        else:
+            lines = text.split('\n')
+            if lines[-1] == '':
+                lines.pop()
+            for parser.line_number, line in enumerate(lines, 1):
+                parser.parse_line(line)
+    except yaml_parser.YamlStructureError as e:
+        return str(e)
+    return 'ok', parser.flags
+
+
+class ParseTextTest(unittest.TestCase):
+
+    def test_valid_document(self):
+        text = '\n'.join(['12:'] + VALID_TASK + VALID_RELEASE + ['11:'] + VALID_TASK)
+        self.assertEqual(parse(text, blocks=True)[0], 'ok')
+        self.assertEqual(parse(text, blocks=True), parse(text, blocks=False))
+
+    def test_invalid_documents(self):
+        invalid = [
+            '12:\n  - task: htt\n',                                      # Неверная ссылка на задачу
+            '12:\n  - task: https://a/b\n    arch: x86\n',               # Неизвестная архитектура
+            '12:\n  - task: https://a/b\n    feature: |\n',              # Пропущена архитектура
+            '12:\n  - release: 5\n    base: 4\n',                        # Пропущена дата
+            '12:\n' + '\n'.join(VALID_TASK[:3]) + '\n   three\n',        # Неверный отступ описания
+        ]
+        for text in invalid:
+            with self.subTest(text=text):
+                self.assertIsInstance(parse(text, blocks=True), str)
+                self.assertEqual(parse(text, blocks=True), parse(text, blocks=False))
+
+    def test_blocks_match_lines(self):
+        '''block_pattern повторяет грамматику TRANSITIONS: оба пути дают одинаковый результат'''
+        rng = random.Random(7)
+        for _ in range(5000):
+            doc = []
+            for _ in range(rng.randint(1, 6)):
+                r = rng.random()
+                if r < 0.3:
+                    block = list(VALID_TASK)
+                elif r < 0.6:
+                    block = list(VALID_RELEASE)
+                else:
+                    block = [rng.choice(LINES) for _ in range(rng.randint(1, 6))]
+                if rng.random() < 0.3:
+                    block[rng.randrange(len(block))] = rng.choice(LINES)
+                if rng.random() < 0.2:
+                    block.insert(0, '12:')
+                doc += block
+            text = '\n'.join(doc) + rng.choice(['', '\n', '\n\n'])
+            self.assertEqual(parse(text, blocks=True), parse(text, blocks=False), text)
+
+
+if __name__ == '__main__':
+    unittest.main()